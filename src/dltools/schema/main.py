@@ -1,76 +1,175 @@
 from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
+from itertools import count
 from jsonschema import validate, Draft202012Validator
 
+_tag_counter = count()
+
 class JSONType(ABC):
+    __slots__ = ('_schema_cache', '_validator_cache', '_version', '_or_null')
+
+    # each subclass gets a small int tag at class-creation time; dispatch
+    # can then match on one attribute load instead of type comparisons
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._TAG = next(_tag_counter)
+
+    def __init__(self):
+        self._schema_cache = None
+        self._validator_cache = None
+        self._version = 0
+        self._or_null = None
+
+    def _invalidate(self):
+        # structure changed, cached schema dict and validator are stale
+        self._schema_cache = None
+        self._validator_cache = None
+        self._version += 1
+
+    def cached_schema(self):
+        s = self._schema_cache
+        if s is None:
+            s = self.schema()
+            self._schema_cache = s
+        return s
+
+    def _cached_composite_schema(self, children):
+        # refresh descendants first so a mutated subtree bumps its root's
+        # version before we compare; then a matching (children, versions)
+        # pair means nothing below us changed and the cached dict is good
+        for child in children:
+            child.cached_schema()
+        versions = tuple(child._version for child in children)
+        cache = self._schema_cache
+        if cache is not None and cache[0] == children and cache[1] == versions:
+            return cache[2]
+        built = self.schema()
+        self._schema_cache = (children, versions, built)
+        self._version += 1
+        return built
+
     @property
     def validator(self):
-        return Draft202012Validator(self.schema())
+        # building a Draft202012Validator recompiles the schema, so reuse
+        # one per instance as long as cached_schema() returns the same dict
+        sch = self.cached_schema()
+        v = self._validator_cache
+        if v is None or v[0] is not sch:
+            v = (sch, Draft202012Validator(sch))
+            self._validator_cache = v
+        return v[1]
+
+    def compile(self):
+        # freeze the current schema into one validator and return its
+        # is_valid entry: no recompilation per call and no ValidationError
+        # construction on the pass path. Mutating the schema tree after
+        # compile() is not reflected in the returned checker.
+        #     check = jt.compile()
+        #     for x in xs:
+        #         if not check(x): ...
+        return Draft202012Validator(self.schema()).is_valid
 
     @abstractmethod
     def schema(self):
         pass
 
     # you can use jt.validator.validate(data) to validate data
-    
+
     @property
     def orNull(self):
-        return AnyOf(self, NULL)
+        # one nullable wrapper per instance is enough; INT.orNull and
+        # friends are hit repeatedly in schema authoring
+        a = self._or_null
+        if a is None:
+            a = AnyOf(self, NULL)
+            self._or_null = a
+        return a
 
 class BooleanType(JSONType):
+    __slots__ = ()
+
     # for boolean
     def schema(self):
         return {"type": "boolean"}
 
 class NumberType(JSONType):
+    __slots__ = ()
+
     # for integer or float number
     def schema(self):
         return {"type": "number"}
 
 class IntType(JSONType):
+    __slots__ = ()
+
     # for integer number only
     def schema(self):
         return {"type": "integer"}
 
 class StringType(JSONType):
+    __slots__ = ()
+
     # for string
     def schema(self):
         return {"type": "string"}
 
 class NullType(JSONType):
+    __slots__ = ()
+
     # for null
     def schema(self):
         return {"type": "null"}
 
 class ArrayType(JSONType):
+    __slots__ = ('_item_type', )
+
     def __init__(self, item_type:Optional[JSONType]):
-        self.item_type = item_type
+        super().__init__()
+        self._item_type = item_type
+
+    @property
+    def item_type(self):
+        return self._item_type
+
+    @item_type.setter
+    def item_type(self, value:Optional[JSONType]):
+        self._item_type = value
+        self._invalidate()
+
+    def cached_schema(self):
+        return self._cached_composite_schema((self._item_type, ))
 
     def schema(self):
         return {
             "type": "array",
-            "items": self.item_type.schema()
+            "items": self.item_type.cached_schema()
         }
 
 class Field:
     def __init__(self, name:str, type:JSONType):
         self.name = name
         self.type = type
-    
+
 class StructType(JSONType):
+    __slots__ = ('field_dict', 'additionalProperties')
+
     def __init__(self, additionalProperties=False):
+        super().__init__()
         self.field_dict:Dict[str, JSONType] = {}
         self.additionalProperties = additionalProperties
 
+    def cached_schema(self):
+        return self._cached_composite_schema(tuple(self.field_dict.values()))
+
     def schema(self):
         return {
             "type": "object",
             "properties": {
-                field_name: field_type.schema() for field_name, field_type in self.field_dict.items()
+                field_name: field_type.cached_schema() for field_name, field_type in self.field_dict.items()
             },
             "additionalProperties": self.additionalProperties
         }
-    
+
     # def field(self, name:str, type: JSONType):
     def field(self, *args):
         if len(args)==1:
@@ -80,44 +179,85 @@ class StructType(JSONType):
             field_name = args[0]
             field_type = args[1]
         self.field_dict[field_name] = field_type
+        self._invalidate()
         return self
 
 
 
 class AllOf(JSONType):
+    __slots__ = ('children', '_child_by_type')
+
     def __init__(self, *args):
+        super().__init__()
         self.children = args
+        self._child_by_type = {type(child): child for child in args}
+
+    def cached_schema(self):
+        return self._cached_composite_schema(tuple(self.children))
 
     def schema(self):
         return {
-            "allOf": [child.schema() for child in self.children]
+            "allOf": [child.cached_schema() for child in self.children]
         }
 
 class AnyOf(JSONType):
+    __slots__ = ('children', '_child_by_type', '_owned')
+
     def __init__(self, *args):
-        self.children = args
+        super().__init__()
+        self.children = list(args)
+        self._child_by_type = {type(child): child for child in args}
+        # set by infer_schema on AnyOf instances it builds itself: those
+        # have no outside aliases, so merging may mutate them in place
+        self._owned = False
+
+    def _replace_child(self, old_type, new_child):
+        children = self.children
+        for i, child in enumerate(children):
+            if type(child) is old_type:
+                children[i] = new_child
+                break
+        self._child_by_type.pop(old_type, None)
+        self._child_by_type[type(new_child)] = new_child
+        self._invalidate()
+
+    def cached_schema(self):
+        return self._cached_composite_schema(tuple(self.children))
 
     def schema(self):
         return {
-            "anyOf": [child.schema() for child in self.children]
+            "anyOf": [child.cached_schema() for child in self.children]
         }
 
 class OneOf(JSONType):
+    __slots__ = ('children', '_child_by_type')
+
     def __init__(self, *args):
+        super().__init__()
         self.children = args
+        self._child_by_type = {type(child): child for child in args}
+
+    def cached_schema(self):
+        return self._cached_composite_schema(tuple(self.children))
 
     def schema(self):
         return {
-            "oneOf": [child.schema() for child in self.children]
+            "oneOf": [child.cached_schema() for child in self.children]
         }
 
 class Not(JSONType):
+    __slots__ = ('child', )
+
     def __init__(self, child):
+        super().__init__()
         self.child = child
 
+    def cached_schema(self):
+        return self._cached_composite_schema((self.child, ))
+
     def schema(self):
         return {
-            "not": self.child.schema()
+            "not": self.child.cached_schema()
         }
 
 NUMBER  = NumberType()
@@ -126,24 +266,27 @@ STRING  = StringType()
 NULL    = NullType()
 BOOLEAN = BooleanType()
 
-def _find_instance_type(instance, *types):
-    for type in types:
-        if isinstance(instance, type):
-            return type
-    return None
+# JSONType subclasses are leaves (no user inheritance expected), so the
+# handlers dispatch on schema._TAG: one attribute load feeding a
+# match/case on small ints, which CPython specializes.
+_INT_OR_NUM    = frozenset({IntType, NumberType})
+
+# data-side types eligible for the homogeneous numeric list fast path
+# (bool is a subclass of int but type() never reports it as int)
+_NUMERIC_TYPES = frozenset({int, float})
 
 def _split_anyof_in_strict_mode(schema):
     # in strict mode, we only uses AnyOf for NullType
     null_type = None
     non_null_type = None
-    for type in schema.children:
-        if isinstance(type, NullType):
+    for type_ in schema.children:
+        if type(type_) is NullType:
             assert null_type is None
-            null_type = type
+            null_type = type_
         else:
             assert non_null_type is None
-            non_null_type = type
-    
+            non_null_type = type_
+
     assert null_type is not None
     assert non_null_type is not None
     return null_type, non_null_type
@@ -152,231 +295,320 @@ class IncompatibleScehma(Exception):
     # Cannot infer schema since the data is incompatible against the existing schema
     pass
 
-def _infer_schema(data:Any, schema:Optional[JSONType]=None, strict:bool=False) -> Optional[JSONType]:
-    # We ignore empty array
-
-    # infer schema from data
-    if type(data) == int:
-        # if original schema is int or number, no need to merge
-        if schema is None:
-            return INT
-        if _find_instance_type(schema, IntType, NumberType):
+def _owned_anyof(*children):
+    # an AnyOf built by inference itself, safe to widen in place later
+    schema = AnyOf(*children)
+    schema._owned = True
+    return schema
+
+def _infer_int(data, schema, strict):
+    # if original schema is int or number, no need to merge
+    if schema is None:
+        return INT
+    match schema._TAG:
+        case IntType._TAG | NumberType._TAG:
             return schema
-        if isinstance(schema, NullType):
-            return AnyOf(schema, INT)
-        if _find_instance_type(schema, BooleanType, StringType, ArrayType, StructType):
+        case NullType._TAG:
+            return _owned_anyof(schema, INT)
+        case BooleanType._TAG | StringType._TAG | ArrayType._TAG | StructType._TAG:
             if strict:
                 raise IncompatibleScehma()
-            return AnyOf(schema, INT)
-        if isinstance(schema, AnyOf):
+            return _owned_anyof(schema, INT)
+        case AnyOf._TAG:
             if strict:
                 null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if _find_instance_type(non_null_type, IntType, NumberType):
+                if type(non_null_type) in _INT_OR_NUM:
                     return schema # already included
                 raise IncompatibleScehma()
-            for child in schema.children:
-                if isinstance(child, IntType) or isinstance(child, NumberType):
-                    return schema
-            return AnyOf(*schema.children, INT)
-        assert False
-    
-    if type(data) == float:
-        if schema is None or isinstance(schema, IntType):
+            by_type = schema._child_by_type
+            if IntType in by_type or NumberType in by_type:
+                return schema
+            return _owned_anyof(*schema.children, INT)
+    assert False
+
+def _infer_float(data, schema, strict):
+    if schema is None:
+        return NUMBER # upgrade
+    match schema._TAG:
+        case IntType._TAG:
             return NUMBER # upgrade
-        if isinstance(schema, NumberType):
+        case NumberType._TAG:
             return schema  # no need to upgrade
-        if isinstance(schema, NullType):
-            return AnyOf(schema, NUMBER)
-        if _find_instance_type(schema, BooleanType, StringType, ArrayType, StructType):
+        case NullType._TAG:
+            return _owned_anyof(schema, NUMBER)
+        case BooleanType._TAG | StringType._TAG | ArrayType._TAG | StructType._TAG:
             if strict:
                 raise IncompatibleScehma()
-            return AnyOf(schema, NUMBER)
-        if isinstance(schema, AnyOf):
+            return _owned_anyof(schema, NUMBER)
+        case AnyOf._TAG:
             if strict:
                 null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if isinstance(non_null_type, IntType):
-                    return AnyOf(null_type, NUMBER)
-                if isinstance(non_null_type, NumberType):
+                if type(non_null_type) is IntType:
+                    return _owned_anyof(null_type, NUMBER)
+                if type(non_null_type) is NumberType:
                     return schema # already included
                 raise IncompatibleScehma()
-            return AnyOf(
-                *[t for t in schema.children if not isinstance(t, IntType) and not isinstance(t, NumberType)],
+            by_type = schema._child_by_type
+            if NumberType in by_type:
+                return schema
+            if schema._owned and IntType in by_type:
+                # widen int to number without rebuilding the AnyOf
+                schema._replace_child(IntType, NUMBER)
+                return schema
+            return _owned_anyof(
+                *[child for t, child in by_type.items() if t not in _INT_OR_NUM],
                 NUMBER
             )
-        assert False
-    
-    if type(schema) == bool:
-        if schema is None:
-            return BOOLEAN
-        if isinstance(schema, BooleanType):
+    assert False
+
+def _infer_bool(data, schema, strict):
+    if schema is None:
+        return BOOLEAN
+    match schema._TAG:
+        case BooleanType._TAG:
             return schema  # no need to upgrade
-        if isinstance(schema, NullType):
-            return AnyOf(schema, BOOLEAN)
-        if _find_instance_type(schema, NumberType, IntType, StringType, ArrayType, StructType):
+        case NullType._TAG:
+            return _owned_anyof(schema, BOOLEAN)
+        case NumberType._TAG | IntType._TAG | StringType._TAG | ArrayType._TAG | StructType._TAG:
             if strict:
                 raise IncompatibleScehma()
-            return AnyOf(schema, BOOLEAN)
-        if isinstance(schema, AnyOf):
+            return _owned_anyof(schema, BOOLEAN)
+        case AnyOf._TAG:
             if strict:
                 null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if isinstance(non_null_type, BooleanType):
+                if type(non_null_type) is BooleanType:
                     return schema # already included
                 raise IncompatibleScehma()
-            return AnyOf(
-                *[t for t in schema.children if not isinstance(t, BooleanType)],
-                BOOLEAN
-            )
-        assert False
-        
-    if type(data) == str:
-        if schema is None:
-            return STRING
-        if isinstance(schema, StringType):
+            if BooleanType in schema._child_by_type:
+                return schema
+            return _owned_anyof(*schema.children, BOOLEAN)
+    assert False
+
+def _infer_str(data, schema, strict):
+    if schema is None:
+        return STRING
+    match schema._TAG:
+        case StringType._TAG:
             return schema  # no need to upgrade
-        if isinstance(schema, NullType):
-            return AnyOf(schema, STRING)
-        if _find_instance_type(schema, BooleanType, NumberType, IntType, ArrayType, StructType):
+        case NullType._TAG:
+            return _owned_anyof(schema, STRING)
+        case BooleanType._TAG | NumberType._TAG | IntType._TAG | ArrayType._TAG | StructType._TAG:
             if strict:
                 raise IncompatibleScehma()
-            return AnyOf(schema, STRING)
-        if isinstance(schema, AnyOf):
+            return _owned_anyof(schema, STRING)
+        case AnyOf._TAG:
             if strict:
                 null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if isinstance(non_null_type, StringType):
+                if type(non_null_type) is StringType:
                     return schema # already included
                 raise IncompatibleScehma()
-            return AnyOf(
-                *[t for t in schema.children if not isinstance(t, StringType)],
-                STRING
-            )
-        assert False
-    
-    if data is None:
-        if schema is None:
-            return NullType
-        if isinstance(schema, NullType):
+            if StringType in schema._child_by_type:
+                return schema
+            return _owned_anyof(*schema.children, STRING)
+    assert False
+
+def _infer_none(data, schema, strict):
+    if schema is None:
+        return NULL
+    match schema._TAG:
+        case NullType._TAG:
             return schema  # no need to upgrade
-        if _find_instance_type(schema, BooleanType, NumberType, IntType, StringType, ArrayType, StructType):
-            return AnyOf(schema, NULL)
-        if isinstance(schema, AnyOf):
+        case BooleanType._TAG | NumberType._TAG | IntType._TAG | StringType._TAG | ArrayType._TAG | StructType._TAG:
+            return _owned_anyof(schema, NULL)
+        case AnyOf._TAG:
             if strict:
                 # this schema should include NullType as child
                 return schema
-            return AnyOf(
-                *[t for t in schema.children if not isinstance(t, NullType)],
-                NULL
-            )
-        assert False
-    
-    if type(data) == list:
-        # if data is empty list, we ignroe it since we cannot infer element type
-        new_schema = None
-        array_schema = None
-
-        if schema is None:
-            array_schema = ArrayType(None)
-            new_schema = array_schema
-        elif isinstance(schema, ArrayType):
-            array_schema = schema
-            new_schema = schema
-        elif isinstance(schema, AnyOf):
-            if strict:
-                null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if not isinstance(non_null_type, ArrayType):
-                    raise IncompatibleScehma()
-                array_schema = non_null_type
+            if NullType in schema._child_by_type:
+                return schema
+            return _owned_anyof(*schema.children, NULL)
+    assert False
+
+def _resolve_list_schema(schema, strict):
+    # find (or create) the ArrayType the elements merge into, and the
+    # schema the whole list merges to
+    new_schema = None
+    array_schema = None
+
+    if schema is None:
+        array_schema = ArrayType(None)
+        new_schema = array_schema
+    else:
+        match schema._TAG:
+            case ArrayType._TAG:
+                array_schema = schema
                 new_schema = schema
-            else:
-                children = []
-                for t in schema.children:
-                    if isinstance(t, ArrayType):
-                        assert array_schema is None
-                        array_schema = t
+            case AnyOf._TAG:
+                if strict:
+                    null_type, non_null_type = _split_anyof_in_strict_mode(schema)
+                    if type(non_null_type) is not ArrayType:
+                        raise IncompatibleScehma()
+                    array_schema = non_null_type
+                    new_schema = schema
+                else:
+                    array_schema = schema._child_by_type.get(ArrayType)
+                    if array_schema is None:
+                        array_schema = ArrayType(None)
+                        new_schema = _owned_anyof(*schema.children, array_schema)
                     else:
-                        children.append(t)
-                if array_schema is None:
-                    array_schema = ArrayType(None)
-                    children.append(array_schema)
-                new_schema = AnyOf(*children)
-        elif isinstance(schema, NullType):
-            array_schema = ArrayType(None)
-            new_schema = AnyOf(schema, array_schema)
-        elif _find_instance_type(schema, BooleanType, NumberType, IntType, StringType, StructType):
-            if strict:
-                raise IncompatibleScehma()
-            array_schema = ArrayType(None)
-            new_schema = AnyOf(schema, array_schema)
-        
-        assert new_schema is not None
-        assert array_schema is not None
-        
-        item_schema = array_schema.item_type
-        for v in data:
-            item_schema = _infer_schema(v, schema=item_schema, strict=strict)
-        array_schema.item_type = item_schema
-
-        if array_schema.item_type is None:
-            if isinstance(new_schema, ArrayType):
-                return None
-            if isinstance(new_schema, AnyOf):
-                children = [child for child in new_schema.children if not isinstance(child, ArrayType)]
-                if len(children) == 0:
-                    return None
-                if len(children) == 1:
-                    return children[0]
-                return AnyOf(*children)
-            assert False
-        
-        return new_schema
-    
-    if type(data) == dict:
-        new_schema = None
-        struct_schema = None
-
-        if schema is None:
-            struct_schema = StructType()
-            new_schema = struct_schema
-        elif isinstance(schema, StructType):
-            struct_schema = schema
-            new_schema = struct_schema
-        elif isinstance(schema, AnyOf):
-            if strict:
-                null_type, non_null_type = _split_anyof_in_strict_mode(schema)
-                if not isinstance(non_null_type, StructType):
+                        new_schema = schema
+            case NullType._TAG:
+                array_schema = ArrayType(None)
+                new_schema = _owned_anyof(schema, array_schema)
+            case BooleanType._TAG | NumberType._TAG | IntType._TAG | StringType._TAG | StructType._TAG:
+                if strict:
                     raise IncompatibleScehma()
-                struct_schema = non_null_type
-                new_schema = schema
-            else:
-                children = []
-                for t in schema.children:
-                    if isinstance(t, StructType):
-                        assert struct_schema is None
-                        struct_schema = t
+                array_schema = ArrayType(None)
+                new_schema = _owned_anyof(schema, array_schema)
+
+    assert new_schema is not None
+    assert array_schema is not None
+    return new_schema, array_schema
+
+def _resolve_dict_schema(schema, strict):
+    new_schema = None
+    struct_schema = None
+
+    if schema is None:
+        struct_schema = StructType()
+        new_schema = struct_schema
+    else:
+        match schema._TAG:
+            case StructType._TAG:
+                struct_schema = schema
+                new_schema = struct_schema
+            case AnyOf._TAG:
+                if strict:
+                    null_type, non_null_type = _split_anyof_in_strict_mode(schema)
+                    if type(non_null_type) is not StructType:
+                        raise IncompatibleScehma()
+                    struct_schema = non_null_type
+                    new_schema = schema
+                else:
+                    struct_schema = schema._child_by_type.get(StructType)
+                    if struct_schema is None:
+                        struct_schema = StructType()
+                        new_schema = _owned_anyof(*schema.children, struct_schema)
                     else:
-                        children.append(t)
-                if struct_schema is None:
-                    struct_schema = StructType()
-                    children.append(struct_schema)
-                new_schema = AnyOf(*children)
-        elif isinstance(schema, NullType):
-            struct_schema = StructType()
-            new_schema = AnyOf(schema, struct_schema)
-        elif _find_instance_type(schema, BooleanType, NumberType, IntType, StringType, ArrayType):
-            if strict:
-                raise IncompatibleScehma()
-            struct_schema = StructType()
-            new_schema = AnyOf(schema, struct_schema)
-
-        assert new_schema is not None
-        assert struct_schema is not None
-
-        for key, value in data.items():
-            field_schema = struct_schema.field_dict.get(key)
-            field_schema = _infer_schema(value, schema=field_schema, strict=strict)
-            if field_schema is not None:
-                struct_schema.field_dict[key] = field_schema
+                        new_schema = schema
+            case NullType._TAG:
+                struct_schema = StructType()
+                new_schema = _owned_anyof(schema, struct_schema)
+            case BooleanType._TAG | NumberType._TAG | IntType._TAG | StringType._TAG | ArrayType._TAG:
+                if strict:
+                    raise IncompatibleScehma()
+                struct_schema = StructType()
+                new_schema = _owned_anyof(schema, struct_schema)
+
+    assert new_schema is not None
+    assert struct_schema is not None
+    return new_schema, struct_schema
+
+# One C-level dict probe on type(data) replaces the old linear if/elif
+# cascade. bool gets its own entry (type(True) is bool, never int), and
+# None is keyed by type(None). Containers are walked iteratively by
+# _infer_schema itself.
+_HANDLERS = {
+    int:        _infer_int,
+    float:      _infer_float,
+    bool:       _infer_bool,
+    str:        _infer_str,
+    type(None): _infer_none,
+}
+
+def _array_slot(array_schema):
+    # the slot elements of a list merge into: each element reads the
+    # item type left by its predecessor and writes the merged result back
+    def get():
+        return array_schema.item_type
+    def set_(s):
+        array_schema.item_type = s
+    return get, set_
+
+def _field_slot(struct_schema, key):
+    original = struct_schema.field_dict.get(key)
+    def get():
+        return struct_schema.field_dict.get(key)
+    def set_(s):
+        # a None result (e.g. an empty array) leaves the field as it was
+        if s is not None:
+            struct_schema.field_dict[key] = s
+        elif original is None:
+            struct_schema.field_dict.pop(key, None)
+        else:
+            struct_schema.field_dict[key] = original
+    return get, set_
+
+def _list_finalizer(array_schema, new_schema, set_slot):
+    # runs after every element of the list has been merged; if no element
+    # type could be inferred (empty array), drop the array schema again
+    def finalize():
+        if array_schema.item_type is not None:
+            return
+        if type(new_schema) is ArrayType:
+            set_slot(None)
+            return
+        if type(new_schema) is AnyOf:
+            children = [child for child in new_schema.children if type(child) is not ArrayType]
+            if len(children) == 0:
+                set_slot(None)
+            elif len(children) == 1:
+                set_slot(children[0])
+            else:
+                set_slot(_owned_anyof(*children))
+            return
+        assert False
+    return finalize
 
-        return new_schema
+def _infer_schema(data:Any, schema:Optional[JSONType]=None, strict:bool=False) -> Optional[JSONType]:
+    # We ignore empty array
+    #
+    # Iterative walk with an explicit stack instead of recursion: no
+    # Python frame per nesting level, and documents deeper than the
+    # recursion limit still infer fine. A frame is (data, get, set) where
+    # get/set access the schema slot the data merges into; a bare
+    # callable on the stack is a finalizer that runs once everything
+    # pushed above it has been processed.
+    root = [schema]
+    def set_root(s):
+        root[0] = s
+    stack = [(data, (lambda: root[0]), set_root)]
+    while stack:
+        frame = stack.pop()
+        if callable(frame):
+            frame()
+            continue
+        d, get_slot, set_slot = frame
+        t = type(d)
+        if t is list:
+            new_schema, array_schema = _resolve_list_schema(get_slot(), strict)
+            set_slot(new_schema)
+            kinds = set(map(type, d)) if d else None
+            if kinds is not None and not kinds - _NUMERIC_TYPES:
+                # column-of-numbers fast path: the element type set is
+                # computed in one C-level pass, and merging int/float is
+                # idempotent, so one merge per kind replaces one
+                # dispatched call per element
+                item_schema = array_schema.item_type
+                if int in kinds:
+                    item_schema = _infer_int(0, item_schema, strict)
+                if float in kinds:
+                    item_schema = _infer_float(0.0, item_schema, strict)
+                array_schema.item_type = item_schema
+                continue
+            stack.append(_list_finalizer(array_schema, new_schema, set_slot))
+            get_item, set_item = _array_slot(array_schema)
+            for v in reversed(d):
+                stack.append((v, get_item, set_item))
+        elif t is dict:
+            new_schema, struct_schema = _resolve_dict_schema(get_slot(), strict)
+            set_slot(new_schema)
+            for key, value in reversed(d.items()):
+                stack.append((value, *_field_slot(struct_schema, key)))
+        else:
+            handler = _HANDLERS.get(t)
+            set_slot(handler(d, get_slot(), strict) if handler is not None else None)
+    return root[0]
 
 
 def infer_schema(*data:Any, schema:Optional[JSONType]=None, strict:bool=False) -> Optional[JSONType]:
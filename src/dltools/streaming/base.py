@@ -1,7 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Any, Optional, Dict, Set, Union, Tuple
 from enum import Enum
-from queue import PriorityQueue, Empty
 from collections import deque
 
 ########################################################################
@@ -31,32 +30,30 @@ class _PORT_DICT:
     
     
 class Pipe(ABC):
+    __slots__ = ('_input_port_dict', '_output_port_dict', 'pipeline',
+                 '_input_port_names', '_output_port_names', 'INPUT', 'OUTPUT', '_emit_count')
+
     # Each input port has a unique name among input ports
     # Each output port has a unique name among output ports
     # Sink does not have output ports
     # Source does not have input ports
     def __init__(self, pipeline:"Pipeline", *, input_names:List[str]=[DEFAULT_PORT_NAME], output_names:List[str]=[DEFAULT_PORT_NAME]):
-        self._input_port_dict:Dict[str, "Port"] = {}
-        self._output_port_dict:Dict[str, "Port"] = {}
         self.pipeline = pipeline
-        
-        _input_names = []
-        _output_names = []
-
-        for name in input_names:
-            if name in self._input_port_dict:
-                raise Exception(f"Duplicate input port name: {name}")
-            self._input_port_dict[name] = Port(PortType.INPUT, name, self)
-            _input_names.append(name)
-        self._input_port_names = tuple(_input_names)
-        
-        for name in output_names:
-            if name in self._output_port_dict:
-                raise Exception(f"Duplicate output port name: {name}")
-            self._output_port_dict[name] = Port(PortType.OUTPUT, name, self)
-            _output_names.append(name)
-        self._output_port_names = tuple(_output_names)
-        
+
+        if len(input_names) != len(set(input_names)):
+            raise Exception(f"Duplicate input port name in: {input_names}")
+        self._input_port_dict:Dict[str, "Port"] = {
+            name: Port(PortType.INPUT, name, self) for name in input_names
+        }
+        self._input_port_names = tuple(input_names)
+
+        if len(output_names) != len(set(output_names)):
+            raise Exception(f"Duplicate output port name in: {output_names}")
+        self._output_port_dict:Dict[str, "Port"] = {
+            name: Port(PortType.OUTPUT, name, self) for name in output_names
+        }
+        self._output_port_names = tuple(output_names)
+
         self.INPUT  = _PORT_DICT(self._input_port_dict)
         self.OUTPUT = _PORT_DICT(self._output_port_dict)
         self._emit_count = 0
@@ -98,6 +95,8 @@ class Pipe(ABC):
         return self
 
 class Sink(Pipe):
+    __slots__ = ()
+
     def __init__(self, pipeline:"Pipeline", *, input_names:List[str]=[DEFAULT_PORT_NAME]):
         super().__init__(pipeline, input_names=input_names, output_names=[])
 
@@ -108,6 +107,8 @@ class Sink(Pipe):
         raise Exception("Sink do not have output port")
 
 class Source(Pipe):
+    __slots__ = ()
+
     def __init__(self, pipeline:"Pipeline", *, output_names:List[str]=[DEFAULT_PORT_NAME]):
         super().__init__(pipeline, input_names=[], output_names=output_names)
 
@@ -134,6 +135,8 @@ class Source(Pipe):
 
 
 class Port:
+    __slots__ = ('type', 'name', 'owner', 'connected_ports', 'buffer')
+
     def __init__(self, type:PortType, name:str, owner:Pipe):
         self.type = type
         self.name:str = name
@@ -142,12 +145,18 @@ class Port:
         self.buffer:deque = deque()
 
     def is_buffer_empty(self):
-        try:
-            _ = self.buffer[0]
-            return False
-        except IndexError:
-            return True
-        
+        return not self.buffer
+
+    def _add_connected(self, port:"Port"):
+        cp = self.connected_ports
+        if type(cp) is tuple:
+            # already frozen, rebuild the tuple (connect after freeze is rare)
+            if port not in cp:
+                self.connected_ports = cp + (port, )
+        else:
+            cp.add(port)
+
+
     def connect(self, *ports: Union["Port", Pipe]):
         for port in ports:
             actual_port = None
@@ -162,22 +171,24 @@ class Port:
                     raise Exception("bad port type!")
             if actual_port.type == self.type:
                 raise Exception("Cannot connect between port of the same type!")
-            actual_port.connected_ports.add(self)
-            self.connected_ports.add(actual_port)
+            actual_port._add_connected(self)
+            self._add_connected(actual_port)
     
     def emit(self, data:Any):
         if self.type != PortType.OUTPUT:
             raise Exception("Can only emit data to output port!")
 
-        pipeline = self.owner.pipeline
+        # bind the queue append once; inside the loop each destination is
+        # one buffer load, one append and at most one enqueue
+        q_append = self.owner.pipeline.input_q.append
 
         for port in self.connected_ports:
             # port.owner.on_data_arrival(port.name, data)
-            seq = pipeline.get_and_inc_event_seq()
-            input_was_empty = self.is_buffer_empty()
-            port.buffer.append((seq, data))
+            buffer = port.buffer
+            input_was_empty = not buffer
+            buffer.append(data)
             if input_was_empty:
-                pipeline.input_q.put(InputPortWrapper(port))
+                q_append(port)
 
 
 
@@ -190,6 +201,8 @@ class Splitter(Pipe):
     data from input port "A" will be copied to output port "X" and "Y"
     data from input port "B" will be copied to output port "T" and "V"
     """
+    __slots__ = ('routing', '_routing_ports')
+
     def __init__(self, pipeline:"Pipeline", *, input_names:List[str]=[DEFAULT_PORT_NAME], output_names:List[str]=[DEFAULT_PORT_NAME], routing: Dict[str, Tuple[str]]):
         super().__init__(pipeline, input_names=input_names, output_names=output_names)
         self.routing = routing
@@ -199,41 +212,34 @@ class Splitter(Pipe):
             for output_port_name in mapping:
                 if output_port_name not in self.output_port_names:
                     raise Exception(f"{output_port_name} is not a valid output port")
-
+        # resolve port names to Port objects once, so routing an event is
+        # one dict lookup plus emit calls
+        self._routing_ports:Dict[str, Tuple["Port", ...]] = {
+            input_port_name: tuple(self._output_port_dict[output_port_name] for output_port_name in mapping)
+            for input_port_name, mapping in routing.items()
+        }
 
     def on_data_arrival(self, name:str, data:Any):
-        output_port_names = self.routing[name]
-        for output_port_name in output_port_names:
-            self.get_output_port(output_port_name).emit(data)
-
+        for port in self._routing_ports[name]:
+            port.emit(data)
 
-class InputPortWrapper:
-    def __init__(self, port):
-        self.port = port
-    
-    def __gt__(self, other:"InputPortWrapper"):
-        src_data_seq = self.port.buffer[0][0]
-        dst_data_seq = other.port.buffer[0][0]
-        return src_data_seq > dst_data_seq
 
 class Pipeline:
     def __init__(self):
         self.pipe_dict:Dict[str, Pipe] = {}
-        self.input_q = PriorityQueue()
-        self.event_seq = 0
-    
-    def get_and_inc_event_seq(self):
-        v = self.event_seq
-        self.event_seq + 1
-        return v
-    
+        self._sources:List[Source] = []
+        # pump() is single threaded and ports are enqueued in emit order,
+        # so a plain deque gives FIFO processing without lock or heap cost
+        self.input_q:deque = deque()
+
     def create_pipe(self, name, klass, *args, **kwargs):
         pipe = klass(self, *args, **kwargs)
-        self.pipe_dict[name] = pipe
-        return self
+        return self.register(name, pipe)
 
     def register(self, name:str, pipe:Pipe):
         self.pipe_dict[name] = pipe
+        if isinstance(pipe, Source):
+            self._sources.append(pipe)
         return self
     
     def connect(self, *, src_pipe_name, src_port_name=DEFAULT_PORT_NAME, dst_pipe_name, dst_port_name=DEFAULT_PORT_NAME):
@@ -242,26 +248,32 @@ class Pipeline:
         src_port.connect(dst_port)
         return self
     
+    def freeze(self):
+        # the graph topology is fixed once pumping starts; tuples iterate
+        # faster than sets in the emit hot loop
+        for pipe in self.pipe_dict.values():
+            for port in pipe._input_port_dict.values():
+                port.connected_ports = tuple(port.connected_ports)
+            for port in pipe._output_port_dict.values():
+                port.connected_ports = tuple(port.connected_ports)
+        return self
+
     def pump(self, on_idle=None):
+        self.freeze()
         while True:
             # let all source to pump data into the pipeline
-            for _, pipe in self.pipe_dict.items():
-                if isinstance(pipe, Source):
-                    while True:
-                        if not pipe.pump_wrapper():
-                            break
+            for source in self._sources:
+                while source.pump_wrapper():
+                    pass
             # process the buffered data
-            while True:
-                try:
-                    ipw = self.input_q.get(block=False)
-                    port = ipw.port
-                    pipe = port.owner
-                    _, data = port.buffer.popleft()
-                    pipe.on_data_arrival(port.name, data)
-                    if not port.is_buffer_empty():
-                        self.input_q.put(ipw)
-                except Empty:
-                    break
+            input_q = self.input_q
+            while input_q:
+                port = input_q.popleft()
+                pipe = port.owner
+                data = port.buffer.popleft()
+                pipe.on_data_arrival(port.name, data)
+                if port.buffer:
+                    input_q.append(port)
             
             if on_idle is not None:
                 on_idle()
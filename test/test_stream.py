@@ -4,9 +4,9 @@
 from typing import List, Any, Optional
 from dltools.streaming import Pipe, Source, Sink, Pipeline
 from datetime import datetime, timedelta
+from collections import deque
 import time
 import random
-from functools import reduce
 
 class BankDepositStream(Source):
     def __init__(self, pipeline:"Pipeline"):
@@ -29,18 +29,22 @@ class Square(Pipe):
 class Counter(Pipe):
     def __init__(self, pipeline:Pipeline):
         super().__init__(pipeline)
-        self.deposits = []
+        self.deposits = deque()
+        self.total = 0
 
     def on_data_arrival(self, name:str, data:Any):
         now = datetime.utcnow()
         cut_off = now - timedelta(minutes=1)
+        # keep a running total: each event is O(evicted) instead of
+        # rebuilding the whole window and re-summing it
         self.deposits.append(data)
-        self.deposits = [d for d in self.deposits if d['time'] >= cut_off]
-        amount = reduce(lambda sum, v:sum+v['amount'], self.deposits, 0)
+        self.total += data['amount']
+        while self.deposits and self.deposits[0]['time'] < cut_off:
+            self.total -= self.deposits.popleft()['amount']
         self.emit(
             {
                 "time": now,
-                "amount": amount
+                "amount": self.total
             }
         )
 